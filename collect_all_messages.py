@@ -1,94 +1,131 @@
+import argparse
 import asyncio
 import re
 from urllib.parse import urljoin
-from playwright.async_api import async_playwright
+from sympa_fetch import HostRateLimiter, DEFAULT_MIN_REQUEST_INTERVAL, extract_hrefs, goto, open_pool, page_content
+from sympa_lists import csv_list, get_lists, archive_name, list_output_path
+
+async def collect_month_links(page, month_url, limiter, tag=""):
+    """Message URLs of one month, walking thrdN.html (or mailN.html) until a page fails or has no messages."""
+    month_links = []
+    await goto(page, month_url, limiter)
+    try:
+        await page.click("input[type='submit']", timeout=5000)
+        print(f"🛡️ {tag} Clicked anti-spam inside month page")
+    except Exception:
+        pass
+
+    await page.wait_for_timeout(1000)
+    html = await page_content(page, month_url)
+
+    # Determine whether to use 'thrd' or 'mail'
+    page_prefix = "thrd"
+    if "thrd1.html" not in html and "mail1.html" in html:
+        page_prefix = "mail"
+
+    # ✅ NEW: Visit thrdX.html until one fails or contains no messages
+    i = 1
+    while True:
+        page_path = f"{page_prefix}{i}.html"
+        page_url = urljoin(month_url, page_path)
+        print(f"   🔄 {tag} Checking: {page_url}")
 
-BASE = "https://www.lists.kit.edu/sympa/arc/robotics-worldwide"
-
-async def collect_all_messages():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
-
-        print(f"🔗 Visiting archive index: {BASE}")
-        await page.goto(BASE)
         try:
-            await page.click("input[type='submit']", timeout=8000)
-            print("🛡️ Clicked anti-spam button")
-        except Exception:
-            pass
-
-        month_urls = []
-        for link in await page.locator("a").all():
-            href = await link.get_attribute("href")
-            if href and re.search(r"/robotics-worldwide/\d{4}-\d{2}/$", href):
-                full = urljoin(BASE, href)
-                if full not in month_urls:
-                    month_urls.append(full)
-
-        print(f"📅 Found {len(month_urls)} months to process.")
-        all_links = []
-
-        for month_url in month_urls:
-            print(f"\n📅 Visiting month: {month_url}")
-            month_links = []
-            try:
-                await page.goto(month_url)
-                try:
-                    await page.click("input[type='submit']", timeout=5000)
-                    print("🛡️ Clicked anti-spam inside month page")
-                except Exception:
-                    pass
-
-                await page.wait_for_timeout(1000)
-                html = await page.content()
-
-                # Determine whether to use 'thrd' or 'mail'
-                page_prefix = "thrd"
-                if "thrd1.html" not in html and "mail1.html" in html:
-                    page_prefix = "mail"
-
-                # ✅ NEW: Visit thrdX.html until one fails or contains no messages
-                i = 1
-                while True:
-                    page_path = f"{page_prefix}{i}.html"
-                    page_url = urljoin(month_url, page_path)
-                    print(f"   🔄 Checking: {page_url}")
-
-                    try:
-                        await page.goto(page_url)
-                        await page.wait_for_timeout(500)
-                        inner_html = await page.content()
-                        msgs = re.findall(r'href="(msg\d+\.html)"', inner_html)
-                        if not msgs:
-                            print(f"     🛑 No messages on page {i}, stopping.")
-                            break
-
-                        for msg in msgs:
-                            full_link = urljoin(page_url, msg)
-                            month_links.append(full_link)
-
-                        print(f"     ➕ Found {len(msgs)} messages on page {i}")
-                        i += 1
-                    except Exception as e:
-                        print(f"     ⚠️ Failed to load page {i}: {e}")
-                        break
-
-                if not month_links:
-                    print(f"❌ No messages found in {month_url}")
-
-                all_links.extend(month_links)
-
-            except Exception as e:
-                print(f"⚠️ Error processing {month_url}: {e}")
-
-        # Save to file
-        with open("all_message_links.txt", "w", encoding="utf-8") as f:
-            for link in all_links:
-                f.write(link + "\n")
-
-        print(f"\n✅ Done! Collected {len(all_links)} message links.")
-        await browser.close()
+            await goto(page, page_url, limiter)
+            await page.wait_for_timeout(500)
+            inner_html = await page_content(page, page_url)
+            msgs = re.findall(r'href="(msg\d+\.html)"', inner_html)
+            if not msgs:
+                print(f"     🛑 {tag} No messages on page {i}, stopping.")
+                break
+
+            for msg in msgs:
+                full_link = urljoin(page_url, msg)
+                month_links.append(full_link)
+
+            print(f"     ➕ {tag} Found {len(msgs)} messages on page {i}")
+            i += 1
+        except Exception as e:
+            print(f"     ⚠️ {tag} Failed to load page {i}: {e}")
+            break
+    return month_links
+
+async def collect_list_messages(sympa_list, pool, limiter):
+    base = sympa_list["base"]
+    tag = f"[{sympa_list['name']}]"
+    month_re = re.compile(rf"/{re.escape(archive_name(sympa_list))}/\d{{4}}-\d{{2}}/$")
+    page = await pool.new_page(base)
+
+    print(f"🔗 {tag} Visiting archive index: {base}")
+    await goto(page, base, limiter)
+    try:
+        await page.click("input[type='submit']", timeout=8000)
+        print(f"🛡️ {tag} Clicked anti-spam button")
+    except Exception:
+        pass
+
+    month_urls = []
+    for href in extract_hrefs(await page_content(page, base)):
+        if href and month_re.search(href):
+            full = urljoin(base, href)
+            if full not in month_urls:
+                month_urls.append(full)
+
+    print(f"📅 {tag} Found {len(month_urls)} months to process.")
+    all_links = []
+
+    for month_url in month_urls:
+        print(f"\n📅 {tag} Visiting month: {month_url}")
+        try:
+            month_links = await collect_month_links(page, month_url, limiter, tag)
+            if not month_links:
+                print(f"❌ {tag} No messages found in {month_url}")
+
+            all_links.extend(month_links)
+
+        except Exception as e:
+            print(f"⚠️ {tag} Error processing {month_url}: {e}")
+
+    await page.close()
+
+    # Save to file
+    links_path = list_output_path(sympa_list, "all_message_links.txt")
+    with open(links_path, "w", encoding="utf-8") as f:
+        for link in all_links:
+            f.write(link + "\n")
+
+    print(f"\n✅ {tag} Done! Collected {len(all_links)} message links into {links_path}.")
+
+async def collect_all_messages(list_names=None, min_request_interval=DEFAULT_MIN_REQUEST_INTERVAL,
+                               record_warc=None, replay_warc=None):
+    try:
+        sympa_lists = get_lists(list_names)
+    except ValueError as e:
+        print(f"Error: {e}"); return
+    # Replay never touches the network, so there is nothing to rate-limit
+    limiter = HostRateLimiter(0 if replay_warc else min_request_interval)
+    async with open_pool(headless=False, record_warc=record_warc, replay_warc=replay_warc) as pool:
+        # Lists are crawled concurrently; the shared limiter keeps each host at one request per interval
+        results = await asyncio.gather(*(collect_list_messages(l, pool, limiter) for l in sympa_lists),
+                                       return_exceptions=True)
+        for sympa_list, result in zip(sympa_lists, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ [{sympa_list['name']}] Crawl failed: {type(result).__name__} - {result}")
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Collect message URLs from one or more Sympa archives.")
+    parser.add_argument("--lists", type=csv_list, default=None,
+                        help="List names from sympa_lists.py, comma/semicolon-separated (default: every registered list)")
+    parser.add_argument("--min_request_interval", type=float, default=DEFAULT_MIN_REQUEST_INTERVAL,
+                        help=f"Minimum seconds between requests to the same host "
+                             f"(default: {DEFAULT_MIN_REQUEST_INTERVAL})")
+    parser.add_argument("--record_warc", default=None,
+                        help="Record every response to this WARC file (e.g. crawl.warc.gz); needs warcio")
+    parser.add_argument("--replay_warc", type=csv_list, default=None,
+                        help="Serve pages from these comma/semicolon-separated WARC files instead of the network")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    asyncio.run(collect_all_messages())
+    args = get_args()
+    asyncio.run(collect_all_messages(args.lists, args.min_request_interval,
+                                     record_warc=args.record_warc, replay_warc=args.replay_warc))
@@ -0,0 +1,85 @@
+import argparse
+import time
+from hri_analyze_messages import (
+    PHRASE_EXTRACTORS, HRI_SEED_NORMALIZED, NLP_CHUNK_CHARS,
+    extract_noun_phrases_chunked, extract_person_entities_chunked, filter_for_hri_relevance, get_nlp,
+    load_candidate_store, phrases_text_from, split_for_nlp, text_for_ner
+)
+
+# --- Throughput and overlap of the phrase extractors, over bodies kept in the candidate store ---
+def get_args():
+    parser = argparse.ArgumentParser(description="Compare the 'noun_chunks' and 'fast' phrase extractors.")
+    parser.add_argument("--candidates_store", default="hri_candidates.jsonl",
+                        help="Candidate store written by hri_analyze_messages.py (default: hri_candidates.jsonl)")
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N messages with a body")
+    return parser.parse_args()
+
+def run_extractor(texts_per_message, phrase_extractor):
+    start = time.perf_counter()
+    phrases = [extract_noun_phrases_chunked(texts, min_words_in_phrase=2, phrase_extractor=phrase_extractor)
+               for texts in texts_per_message]
+    return phrases, time.perf_counter() - start
+
+def run_ner(texts_per_message, phrase_extractor):
+    """The NER pass that goes with each extractor (it keeps the parser only for 'noun_chunks')."""
+    start = time.perf_counter()
+    people = [extract_person_entities_chunked(texts, phrase_extractor=phrase_extractor)
+              for texts in texts_per_message]
+    return people, time.perf_counter() - start
+
+def full_pipeline_people(texts_per_message):
+    nlp = get_nlp()
+    return [[ent.text for doc in nlp.pipe(texts, batch_size=1) for ent in doc.ents if ent.label_ == "PERSON"]
+            for texts in texts_per_message]
+
+def overlap(baseline, candidate):
+    """Micro-averaged overlap of per-message phrase sets: (shared, only_baseline, only_candidate, jaccard)."""
+    shared = only_base = only_cand = 0
+    for base_phrases, cand_phrases in zip(baseline, candidate):
+        base_set, cand_set = set(base_phrases), set(cand_phrases)
+        shared += len(base_set & cand_set)
+        only_base += len(base_set - cand_set)
+        only_cand += len(cand_set - base_set)
+    union = shared + only_base + only_cand
+    return shared, only_base, only_cand, (shared / union if union else 1.0)
+
+def main():
+    args = get_args()
+    records = [r for r in load_candidate_store(args.candidates_store) if r.get("has_body")]
+    if args.limit:
+        records = records[:args.limit]
+    if not records:
+        print(f"No message bodies in {args.candidates_store}."); return
+
+    texts_per_message = [[phrases_text_from(chunk) for chunk in split_for_nlp(r["body_text"], NLP_CHUNK_CHARS)]
+                         for r in records]
+    ner_texts_per_message = [[text_for_ner(r.get("subject", "") if i == 0 else "", chunk)
+                              for i, chunk in enumerate(split_for_nlp(r["body_text"], NLP_CHUNK_CHARS))]
+                             for r in records]
+    total_chars = sum(len(t) for texts in texts_per_message for t in texts)
+    get_nlp()  # keep model loading out of the timings
+
+    results = {}
+    reference_people = full_pipeline_people(ner_texts_per_message)
+    print(f"Comparing phrase extractors on {len(records)} messages ({total_chars} chars)\n")
+    print(f"{'extractor':<12} {'seconds':>9} {'NER s':>9} {'total s':>9} {'msgs/s':>9} {'kchars/s':>9} "
+          f"{'phrases':>9} {'HRI kept':>9} {'NER diff':>9}")
+    for phrase_extractor in PHRASE_EXTRACTORS:
+        phrases, seconds = run_extractor(texts_per_message, phrase_extractor)
+        people, ner_seconds = run_ner(ner_texts_per_message, phrase_extractor)
+        hri = [filter_for_hri_relevance(p, HRI_SEED_NORMALIZED) for p in phrases]
+        results[phrase_extractor] = (phrases, hri)
+        # NER diff: messages whose PERSON entities differ from a full-pipeline run
+        ner_diff = sum(found != reference for found, reference in zip(people, reference_people))
+        print(f"{phrase_extractor:<12} {seconds:>9.2f} {ner_seconds:>9.2f} {seconds + ner_seconds:>9.2f} "
+              f"{len(records) / seconds:>9.1f} {total_chars / seconds / 1000:>9.1f} {sum(map(len, phrases)):>9} "
+              f"{sum(map(len, hri)):>9} {ner_diff:>9}")
+
+    baseline, fast = results["noun_chunks"], results["fast"]
+    for label, index in (("all candidate phrases", 0), ("HRI-relevant phrases", 1)):
+        shared, only_base, only_fast, jaccard = overlap(baseline[index], fast[index])
+        print(f"\nOverlap, {label}: {shared} shared, {only_base} only noun_chunks, {only_fast} only fast "
+              f"(Jaccard {jaccard:.3f})")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 import asyncio
 import csv
+import json
+import os
 import re
-from playwright.async_api import async_playwright
+from functools import lru_cache
 import string
 import spacy
+from spacy.matcher import Matcher
 from bs4 import BeautifulSoup, NavigableString, Comment
 import traceback  # For detailed error logging if needed
+from sympa_fetch import HostRateLimiter, DEFAULT_MIN_REQUEST_INTERVAL, goto, open_pool, page_content
+from sympa_lists import csv_list, get_lists, list_output_path
 
 # --- Command-Line Date Filtering Configuration ---
 def get_date_args():
@@ -19,11 +24,6 @@ def get_date_args():
         except ValueError:
             raise argparse.ArgumentTypeError(f"Invalid date format: '{s}'. Use YYYY-MM (e.g., 2021-08)")
 
-    def csv_list(s: str):
-        # Accept comma/semicolon separated; trim and drop empties
-        parts = re.split(r"[;,]", s)
-        return [p.strip() for p in parts if p.strip()]
-
     parser = argparse.ArgumentParser(description="Filter mailing list URLs by date range.")
     parser.add_argument("--start_date", type=valid_yyyymm, default=(2021, 8),
                         help="Start date in YYYY-MM format (default: 2021-08)")
@@ -32,10 +32,41 @@ def get_date_args():
     parser.add_argument("--extra_seeds", type=csv_list, default=[],
                         help="Extra HRI seed keywords (comma/semicolon-separated). "
                              "Example: --extra_seeds 'cobot, proxemics;shared-control'")
+    parser.add_argument("--refilter", action="store_true",
+                        help="Skip the browser and page parsing; re-apply HRI filtering and people cleanup "
+                             "to the stored candidates and regenerate the summary CSV. spaCy is only loaded "
+                             "if a message needs subject-fallback phrases that were never extracted.")
+    parser.add_argument("--candidates_store", default="hri_candidates.jsonl",
+                        help="JSONL file of unfiltered per-message candidates, inside each list's output "
+                             "namespace (default: hri_candidates.jsonl)")
+    parser.add_argument("--nlp_chunk_chars", type=nlp_chunk_chars_arg, default=NLP_CHUNK_CHARS,
+                        help="Max characters per spaCy call; longer bodies are split on paragraphs (default: 100000)")
+    parser.add_argument("--max_body_chars", type=max_body_chars_arg, default=MAX_BODY_CHARS,
+                        help="Per-message body size budget; longer bodies are truncated (default: 2000000)")
+    parser.add_argument("--max_html_mb", type=max_html_mb_arg, default=MAX_HTML_MB,
+                        help="Per-message HTML budget in MB of UTF-8; larger pages are skipped unparsed (default: 20)")
+    parser.add_argument("--phrase_extractor", choices=PHRASE_EXTRACTORS, default="noun_chunks",
+                        help="'noun_chunks' (dependency parser) or 'fast' (POS patterns, parser disabled)")
+    parser.add_argument("--lists", type=csv_list, default=None,
+                        help="Sympa lists to analyze, from sympa_lists.py (default: every registered list)")
+    parser.add_argument("--min_request_interval", type=float, default=DEFAULT_MIN_REQUEST_INTERVAL,
+                        help=f"Minimum seconds between requests to the same host "
+                             f"(default: {DEFAULT_MIN_REQUEST_INTERVAL})")
+    parser.add_argument("--record_warc", default=None,
+                        help="Record every response to this WARC file (e.g. analysis.warc.gz); needs warcio")
+    parser.add_argument("--replay_warc", type=csv_list, default=None,
+                        help="Serve message pages from these WARC files instead of the network (no browser)")
     return parser.parse_args()
 
 # --- NLP Setup ---
-nlp = spacy.load("en_core_web_sm")
+# Loaded lazily so --refilter runs that never touch spaCy don't pay for the model load.
+_NLP = None
+
+def get_nlp():
+    global _NLP
+    if _NLP is None:
+        _NLP = spacy.load("en_core_web_sm")
+    return _NLP
 
 STOPWORDS = {
     "an","the","and","for","with","that","this","from","you","have","are","will","your","has","been",
@@ -138,11 +169,12 @@ def include_sender(people_list, sender_name):
 
 # --- Person cleanup helpers (titles, capitalization guards) ---
 TITLE_PREFIXES = {"prof","prof.","dr","dr.","mr","mr.","ms","ms.","mrs","mrs.","sir","madam","mx","mx."}
+TITLE_TOKENS = {t.strip(".") for t in TITLE_PREFIXES}
 LOWER_PARTICLES = {"de","da","del","van","von","di","la","le","du","dos","das","bin","al","ibn","mac","mc","der"}
 
 def strip_leading_titles(name: str) -> str:
     parts = name.strip().split()
-    while parts and parts[0].lower().strip(".") in {t.strip(".") for t in TITLE_PREFIXES}:
+    while parts and parts[0].lower().strip(".") in TITLE_TOKENS:
         parts = parts[1:]
     return " ".join(parts)
 
@@ -168,53 +200,116 @@ PEOPLE_PHRASE_DENY_REGEX = re.compile(
     re.I
 )
 PEOPLE_TOKEN_DENY = {"curriculum","vitae","resume","regards","thanks","thank","dear","unsubscribe","signature","sig"}
+PEOPLE_JUNK_REGEX = re.compile(r'from.*@|header|footer|list|unsubscribe')
+NAME_CHARS_REGEX = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿĀ-ž\s'.’-]+")
+VOWEL_REGEX = re.compile(r"[aeiouAEIOU]")
+
+# Same names recur across thousands of messages; verdicts are pure functions of the string, so cache them corpus-wide.
+PEOPLE_VERDICT_CACHE_SIZE = 65536
 
 def _normalize_simple(s: str) -> str:
     return re.sub(r"\s+", " ", re.sub(r"[^\w\s'-]+", " ", s)).strip().lower()
 
 # --- Helper Functions (people) ---
-def is_clean_name(name: str) -> bool:
-    if not name or any(ch.isdigit() for ch in name):
-        return False
-    name = strip_leading_titles(name).strip()
-    if not name:
-        return False
-    if PEOPLE_PHRASE_DENY_REGEX.search(name) or PEOPLE_PHRASE_DENY_REGEX.search(_normalize_simple(name)):
+# Each check below runs once per candidate. The previous chain (NER guards -> post-filter -> is_clean_name,
+# then include_sender -> post-filter -> is_clean_name -> deny cleanup) repeated most of them; the repeats
+# were provably no-ops (title stripping is idempotent, a deny phrase in a suffix is also in the whole).
+def _has_denied_phrase(s: str) -> bool:
+    return bool(PEOPLE_PHRASE_DENY_REGEX.search(s) or PEOPLE_PHRASE_DENY_REGEX.search(_normalize_simple(s)))
+
+def _name_shape_ok(name: str, parts) -> bool:
+    """The is_clean_name checks that remain once titles are stripped, digits and deny phrases ruled out."""
+    if not (2 <= len(parts) <= 5):
         return False
-    parts = name.split()
     if any(p.lower() in PEOPLE_TOKEN_DENY for p in parts):
         return False
-    if not (2 <= len(parts) <= 5):
-        return False
     if not capitalized_name_pattern(name):
         return False
-    if not re.fullmatch(r"[A-Za-zÀ-ÖØ-öø-ÿĀ-ž\s'.’-]+", name):
+    if not NAME_CHARS_REGEX.fullmatch(name):
         return False
-    if any(bad in name.lower() for bad in NAME_BAD_SUBSTRINGS):
+    lower_name = name.lower()
+    if any(bad in lower_name for bad in NAME_BAD_SUBSTRINGS):
         return False
     if any(DOMAINY_TOKEN.search(tok.lower()) for tok in parts):
         return False
-    vowel_tokens = sum(1 for tok in parts if re.search(r"[aeiouAEIOU]", tok))
+    vowel_tokens = sum(1 for tok in parts if VOWEL_REGEX.search(tok))
     return vowel_tokens >= 2
 
-def post_filter_people(people):
-    cleaned, seen = [], set()
-    for p in people:
-        if not isinstance(p, str):
-            continue
-        if '@' in p or any(ch.isdigit() for ch in p):
-            continue
-        if PEOPLE_PHRASE_DENY_REGEX.search(p) or PEOPLE_PHRASE_DENY_REGEX.search(_normalize_simple(p)):
-            continue
-        candidate = strip_leading_titles(p).strip()
-        if not candidate:
-            continue
-        if 2 <= len(candidate.split()) <= 5 and all(2 <= len(tok) <= 25 for tok in candidate.split()):
-            if not re.search(r'from.*@|header|footer|list|unsubscribe', candidate.lower()):
-                if is_clean_name(candidate) and candidate not in seen:
-                    seen.add(candidate)
-                    cleaned.append(candidate)
-    return cleaned
+def _post_filter_shape_ok(candidate: str, parts) -> bool:
+    """The post-filter guards on a title-stripped candidate (token lengths, list junk), then is_clean_name's."""
+    if not all(2 <= len(tok) <= 25 for tok in parts):
+        return False
+    if PEOPLE_JUNK_REGEX.search(candidate.lower()):
+        return False
+    return _name_shape_ok(candidate, parts)
+
+@lru_cache(maxsize=PEOPLE_VERDICT_CACHE_SIZE)
+def is_clean_name(name: str) -> bool:
+    if not name or any(ch.isdigit() for ch in name):
+        return False
+    name = strip_leading_titles(name).strip()
+    if not name:
+        return False
+    if _has_denied_phrase(name):
+        return False
+    return _name_shape_ok(name, name.split())
+
+@lru_cache(maxsize=PEOPLE_VERDICT_CACHE_SIZE)
+def _post_filter_verdict(p: str):
+    """Title-stripped form of a free-text name candidate (e.g. the sender) if it passes the post-filter, or None."""
+    if '@' in p or any(ch.isdigit() for ch in p):
+        return None
+    if _has_denied_phrase(p):
+        return None
+    candidate = strip_leading_titles(p).strip()
+    if not candidate:
+        return None
+    return candidate if _post_filter_shape_ok(candidate, candidate.split()) else None
+
+@lru_cache(maxsize=PEOPLE_VERDICT_CACHE_SIZE)
+def person_entity_verdict(ent_text: str):
+    """Validated name for one raw spaCy PERSON entity text, or None."""
+    candidate = ent_text.strip().strip('"<>:')
+    if '@' in candidate or len(candidate) < 2:
+        return None
+    candidate = strip_leading_titles(candidate)
+    if not candidate or len(candidate) >= 80:
+        return None
+    parts = candidate.split()
+    lower_candidate = candidate.lower()
+    if lower_candidate in STOPWORDS or lower_candidate in PERSON_NER_ERROR_BLACKLIST:
+        return None
+    if len(parts) <= 2 and any(kw in lower_candidate for kw in ORG_LOCATION_KEYWORDS_FOR_PERSON_FILTER):
+        return None
+    # NAME_CHARS_REGEX (inside _name_shape_ok) already rules out digits and '@'
+    if _has_denied_phrase(candidate):
+        return None
+    return candidate if _post_filter_shape_ok(candidate, parts) else None
+
+def validate_people(person_entities, sender_name=None):
+    """
+    Single pass over raw PERSON entities (plus the sender, if given) producing the final sorted people list.
+    Matches the previous include_sender + post-filter + is_clean_name + sender guard + deny cleanup chain.
+    """
+    people = set()
+    for ent_text in set(person_entities):
+        name = person_entity_verdict(ent_text)
+        if name:
+            people.add(name)
+
+    if sender_name is not None:
+        merged = include_sender([], sender_name)
+        if merged:
+            name = _post_filter_verdict(merged[0])
+            if name:
+                people.add(name)
+
+        # Final guard: ensure sender appears if it looks like a real name
+        sn = strip_leading_titles((sender_name or "").strip('"\':<> ').strip())
+        if sn and sn != "Unknown Name" and is_clean_name(sn):
+            people.add(sn)
+
+    return sorted(people)
 
 def clean_text(text):
     text = text.translate(str.maketrans("", "", string.punctuation))
@@ -272,53 +367,152 @@ def extract_sympa_body(soup: BeautifulSoup) -> str:
 # put once at module level for efficiency
 SEED_SINGLETONS = {w.lower() for w in HRI_SEED_KEYWORDS}
 
-def extract_noun_phrases_and_people(text_for_phrases: str, text_for_ner_input: str,
-                                    min_words_in_phrase=2, min_letters_per_word=2):
-    doc_phr = nlp(text_for_phrases)
-    doc_ner = nlp(text_for_ner_input)
-
-    valid_phrases, people = [], set()
-
-    # --- HRI phrases ---
-    for chunk in doc_phr.noun_chunks:
+# --- Phrase extractors ---
+# "noun_chunks" needs the dependency parser, the most expensive part of en_core_web_sm, and parses poorly on the
+# lowercased, punctuation-stripped phrase text anyway. "fast" also disables the parser and takes maximal
+# ADJ/NOUN/PROPN runs ending in a noun from the tagger output; compare_phrase_extractors.py measures the trade-off.
+# Neither phrase pass reads entities (the NER pass runs separately on case-preserved text), so both skip ner.
+PHRASE_EXTRACTORS = ("noun_chunks", "fast")
+PHRASE_DISABLED_PIPES = {"noun_chunks": ["ner"], "fast": ["parser", "ner"]}
+_NP_MATCHER = None
+_NER_DISABLED_PIPES = {}
+
+def get_np_matcher():
+    global _NP_MATCHER
+    if _NP_MATCHER is None:
+        _NP_MATCHER = Matcher(get_nlp().vocab)
+        _NP_MATCHER.add("NP", [[{"POS": {"IN": ["ADJ", "NOUN", "PROPN"]}, "OP": "*"},
+                                {"POS": {"IN": ["NOUN", "PROPN"]}}]], greedy="LONGEST")
+    return _NP_MATCHER
+
+def get_ner_disabled_pipes(phrase_extractor="noun_chunks"):
+    """
+    Pipes the NER pass can skip. It only reads doc.ents and en_core_web_sm's ner has its own internal tok2vec,
+    so tagger, attribute_ruler and lemmatizer never run. ner will not start an entity across a sentence start,
+    though, and those come from the parser: the parser (and the tok2vec it listens to) is kept so entities
+    match a full-pipeline run, except with the "fast" extractor, which trades that for speed here too.
+    """
+    if phrase_extractor not in _NER_DISABLED_PIPES:
+        nlp = get_nlp()
+        needed = {"ner"} if phrase_extractor == "fast" else {"ner", "parser"}
+        needed |= {name for name, pipe in nlp.pipeline
+                   if needed & set(getattr(pipe, "listening_components", ()))}
+        _NER_DISABLED_PIPES[phrase_extractor] = [name for name in nlp.pipe_names if name not in needed]
+    return _NER_DISABLED_PIPES[phrase_extractor]
+
+def _candidate_spans(doc_phr, phrase_extractor):
+    if phrase_extractor == "fast":
+        # greedy="LONGEST" returns non-overlapping maximal matches, but not in document order
+        return sorted(get_np_matcher()(doc_phr, as_spans=True), key=lambda span: span.start)
+    return doc_phr.noun_chunks
+
+def _phrases_from_doc(doc_phr, min_words_in_phrase, min_letters_per_word, phrase_extractor="noun_chunks"):
+    for chunk in _candidate_spans(doc_phr, phrase_extractor):
         lemmas = [tok.lemma_ for tok in chunk
                   if tok.lemma_ not in STOPWORDS and tok.is_alpha and len(tok.lemma_) >= min_letters_per_word]
         if len(lemmas) >= min_words_in_phrase:
-            valid_phrases.append(" ".join(lemmas))
+            yield " ".join(lemmas)
         elif len(lemmas) == 1 and lemmas[0].lower() in SEED_SINGLETONS:
-            valid_phrases.append(lemmas[0])
+            yield lemmas[0]
+
+def extract_noun_phrases_chunked(texts_for_phrases, min_words_in_phrase=2, min_letters_per_word=2,
+                                 phrase_extractor="noun_chunks"):
+    """Noun-chunk phrases over consecutive text chunks, merged in order; only one Doc is alive at a time."""
+    valid_phrases = []
+    for doc_phr in get_nlp().pipe(texts_for_phrases, disable=PHRASE_DISABLED_PIPES[phrase_extractor],
+                                  batch_size=NLP_BATCH_SIZE):
+        valid_phrases.extend(_phrases_from_doc(doc_phr, min_words_in_phrase, min_letters_per_word,
+                                               phrase_extractor))
 
     # de-dupe, preserve order
     seen = set()
-    valid_phrases = [p for p in valid_phrases if not (p in seen or seen.add(p))]
-
-    # --- PERSON NER ---
-    for ent in doc_ner.ents:
-        if ent.label_ != "PERSON":
-            continue
-        candidate = ent.text.strip().strip('"<>:')
-        if '@' in candidate or len(candidate) < 2:
-            continue
-        candidate = strip_leading_titles(candidate)
-        if not candidate:
-            continue
-        parts = candidate.split()
-        if not (2 <= len(parts) <= 5 and len(candidate) < 80):
-            continue
-        if not capitalized_name_pattern(candidate):
-            continue
-        if not re.fullmatch(r"[A-Za-zÀ-ÖØ-öø-ÿĀ-ž\s'.’-]+", candidate):
-            continue
-        lower_candidate = candidate.lower()
-        if lower_candidate in STOPWORDS or lower_candidate in PERSON_NER_ERROR_BLACKLIST:
-            continue
-        if len(parts) <= 2 and any(kw in lower_candidate for kw in ORG_LOCATION_KEYWORDS_FOR_PERSON_FILTER):
-            continue
-        people.add(candidate)
-
-    filtered = post_filter_people(list(people))
-    cleaned = [p for p in filtered if is_clean_name(p)]
-    return valid_phrases, cleaned
+    return [p for p in valid_phrases if not (p in seen or seen.add(p))]
+
+def extract_person_entities_chunked(texts_for_ner, phrase_extractor="noun_chunks"):
+    """Raw PERSON entity texts, in document order, before any cleanup (these are what the store keeps)."""
+    disable = get_ner_disabled_pipes(phrase_extractor)
+    return [ent.text for doc_ner in get_nlp().pipe(texts_for_ner, disable=disable, batch_size=NLP_BATCH_SIZE)
+            for ent in doc_ner.ents if ent.label_ == "PERSON"]
+
+# --- Size/memory budgets for very large message bodies ---
+# spaCy memory grows with Doc length, so long bodies are fed in paragraph-aligned chunks and each Doc is
+# dropped before the next one is built. nlp.pipe() would otherwise batch up to nlp.batch_size (1000) texts
+# through every component together, i.e. the whole body at once. Bodies shorter than one chunk are processed
+# exactly as before.
+NLP_BATCH_SIZE = 1
+SPACY_MAX_LENGTH = 1_000_000       # nlp.max_length default; longer texts raise spaCy error E088
+NLP_CHUNK_CHARS = 100_000          # per spaCy call; must stay below SPACY_MAX_LENGTH
+MAX_BODY_CHARS = 2_000_000         # body text beyond this is cut at a paragraph boundary before NLP
+MAX_HTML_MB = 20                   # pages larger than this (UTF-8 bytes) are not parsed at all (bs4 trees are ~10x)
+
+class MessageTooLarge(Exception):
+    pass
+
+def nlp_chunk_chars_arg(s):
+    """argparse type for --nlp_chunk_chars: 0 < n < SPACY_MAX_LENGTH."""
+    import argparse
+    try:
+        n = int(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid chunk size: '{s}'. Use a whole number of characters.")
+    if not 0 < n < SPACY_MAX_LENGTH:
+        raise argparse.ArgumentTypeError(f"Chunk size must be between 1 and {SPACY_MAX_LENGTH - 1}, got {n}.")
+    return n
+
+def max_body_chars_arg(s):
+    """argparse type for --max_body_chars: a positive number of characters."""
+    import argparse
+    try:
+        n = int(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid body budget: '{s}'. Use a whole number of characters.")
+    if n <= 0:
+        raise argparse.ArgumentTypeError(f"Body budget must be at least 1 character, got {n}.")
+    return n
+
+def max_html_mb_arg(s):
+    """argparse type for --max_html_mb: a positive number of megabytes."""
+    import argparse
+    try:
+        mb = float(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid HTML budget: '{s}'. Use a number of megabytes (e.g. 20 or 0.5).")
+    if not mb > 0:  # also rejects nan
+        raise argparse.ArgumentTypeError(f"HTML budget must be greater than 0 MB, got {s}.")
+    return mb
+
+def _hard_split(paragraph: str, max_chars: int):
+    while len(paragraph) > max_chars:
+        cut = max(paragraph.rfind(" ", 0, max_chars), paragraph.rfind("\n", 0, max_chars))
+        if cut <= 0:
+            cut = max_chars
+        yield paragraph[:cut]
+        paragraph = paragraph[cut:].lstrip()
+    if paragraph:
+        yield paragraph
+
+def split_for_nlp(text: str, max_chars=NLP_CHUNK_CHARS):
+    """Split text on paragraph boundaries into chunks of at most max_chars (oversized paragraphs on whitespace)."""
+    if max_chars <= 0:
+        raise ValueError(f"max_chars must be positive, got {max_chars}")
+    if len(text) <= max_chars:
+        return [text]
+    chunks, current = [], ""
+    for paragraph in re.split(r'\n\s*\n', text):
+        for piece in _hard_split(paragraph, max_chars):
+            if current and len(current) + 2 + len(piece) > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def truncate_at_paragraph(text: str, max_chars=MAX_BODY_CHARS) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n\n", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
 
 # --- HRI relevance with normalized seed matching & stronger guards ---
 _PUNC_TBL = str.maketrans("", "", string.punctuation)
@@ -326,7 +520,7 @@ _PUNC_TBL = str.maketrans("", "", string.punctuation)
 def _normalize_token(tok: str) -> str:
     return tok.translate(_PUNC_TBL).lower()
 
-HRI_SEED_NORMALIZED = {_normalize_token(w) for w in HRI_SEED_KEYWORDS if _normalize_token(w)}
+HRI_SEED_NORMALIZED = frozenset(_normalize_token(w) for w in HRI_SEED_KEYWORDS if _normalize_token(w))
 
 # Require at least one *strong* HRI token by prefix
 STRONG_HRI_PREFIXES = (
@@ -353,49 +547,83 @@ def _has_strong_hri_token(tokens_norm):
                 return True
     return False
 
-def filter_for_hri_relevance(phrases, seed_keywords_normalized=HRI_SEED_NORMALIZED):
-    kept = []
-    for phrase in phrases:
-        raw_tokens = phrase.split()
-        toks_norm = [_normalize_token(t) for t in raw_tokens if t]
-        toks_set = set(toks_norm)
-        if not toks_set:
-            continue
+# Verdicts depend only on the phrase, the seed set and the module-level constants above (fixed for a run),
+# so they are cached corpus-wide keyed on the seed-set fingerprint.
+PHRASE_VERDICT_CACHE_SIZE = 131072
 
-        # single-token allowance
-        if len(toks_norm) == 1:
-            t = toks_norm[0]
-            if (t in seed_keywords_normalized) or _has_strong_hri_token([t]):
-                kept.append(phrase)
-            continue
+def seed_fingerprint(seed_keywords_normalized):
+    # frozenset() of a frozenset is the same object, so callers holding a frozenset pay nothing here
+    return frozenset(seed_keywords_normalized)
 
-        # multi-token logic
-        if not (toks_set & seed_keywords_normalized):
-            continue
-        if not _has_strong_hri_token(toks_norm):
-            continue
-        if toks_set & HRI_PHRASE_DENY_TOKENS:
-            continue
-        if HRI_ADMIN_REGEX.search(" ".join(toks_norm)):
-            continue
-        if not (2 <= len(toks_norm) <= 8):
-            continue
-        if not any(len(t) >= 4 for t in toks_norm):
-            continue
-        sw_ratio = sum(1 for t in raw_tokens if t.lower() in STOPWORDS) / max(1, len(raw_tokens))
-        if sw_ratio > 0.5:
-            continue
+@lru_cache(maxsize=PHRASE_VERDICT_CACHE_SIZE)
+def _phrase_verdict(phrase, seed_keywords_fingerprint):
+    raw_tokens = phrase.split()
+    toks_norm = [_normalize_token(t) for t in raw_tokens if t]
+    toks_set = set(toks_norm)
+    if not toks_set:
+        return False
 
-        kept.append(phrase)
+    # single-token allowance
+    if len(toks_norm) == 1:
+        t = toks_norm[0]
+        return (t in seed_keywords_fingerprint) or _has_strong_hri_token([t])
+
+    # multi-token logic
+    if not (toks_set & seed_keywords_fingerprint):
+        return False
+    if not _has_strong_hri_token(toks_norm):
+        return False
+    if toks_set & HRI_PHRASE_DENY_TOKENS:
+        return False
+    if HRI_ADMIN_REGEX.search(" ".join(toks_norm)):
+        return False
+    if not (2 <= len(toks_norm) <= 8):
+        return False
+    if not any(len(t) >= 4 for t in toks_norm):
+        return False
+    sw_ratio = sum(1 for t in raw_tokens if t.lower() in STOPWORDS) / max(1, len(raw_tokens))
+    return sw_ratio <= 0.5
 
+def filter_for_hri_relevance(phrases, seed_keywords_normalized=HRI_SEED_NORMALIZED, phrase_verdicts=None):
+    """
+    phrase_verdicts, if given, is a complete {phrase: kept} map from judge_phrases for these seeds (the replay
+    path); phrases missing from it are judged and added. Otherwise the bounded verdict cache is used.
+    """
+    fingerprint = seed_fingerprint(seed_keywords_normalized)
     # de-dupe, preserve order
     seen, out = set(), []
-    for p in kept:
-        if p not in seen:
-            seen.add(p)
-            out.append(p)
+    for phrase in phrases:
+        if phrase in seen:
+            continue
+        seen.add(phrase)
+        if phrase_verdicts is None:
+            kept = _phrase_verdict(phrase, fingerprint)
+        else:
+            kept = phrase_verdicts.get(phrase)
+            if kept is None:
+                kept = phrase_verdicts[phrase] = _phrase_verdict.__wrapped__(phrase, fingerprint)
+        if kept:
+            out.append(phrase)
     return out
 
+def judge_phrases(phrases, seed_keywords_normalized=HRI_SEED_NORMALIZED):
+    """
+    Judge a whole corpus's unique phrases in one pass; returns {phrase: kept}. This bypasses the bounded cache,
+    which a large corpus would overflow (evicting its own warm-up); pass the map to filter_for_hri_relevance.
+    """
+    fingerprint = seed_fingerprint(seed_keywords_normalized)
+    judge = _phrase_verdict.__wrapped__
+    return {phrase: judge(phrase, fingerprint) for phrase in dict.fromkeys(phrases)}
+
+def report_cache_stats():
+    for label, cached_fn in (("Phrase verdict cache", _phrase_verdict),
+                             ("People verdict cache", person_entity_verdict)):
+        info = cached_fn.cache_info()
+        lookups = info.hits + info.misses
+        if lookups:
+            print(f"🧠 {label}: {info.hits}/{lookups} hits ({100 * info.hits / lookups:.1f}%), "
+                  f"{info.currsize} entries")
+
 # --- URL extraction from HTML (anchors + bare links) ---
 def extract_urls_from_html(html_snippet):
     if not html_snippet:
@@ -414,6 +642,7 @@ def extract_urls_from_html(html_snippet):
     text = soup.get_text(" ", strip=True)
     url_pattern = re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+')
     urls.update(url_pattern.findall(text))
+    soup.decompose()
 
     return sorted(urls)
 
@@ -497,240 +726,433 @@ def get_body_text_from_html(html_snippet):
     for tag in soup(['script','style','noscript','meta','title','head','link',
                      'button','input','select','textarea','form','nav','footer','header','aside']):
         tag.decompose()
-    return re.sub(r'\n\s*\n+', '\n\n', soup.get_text(separator='\n', strip=True)).strip()
+    text = soup.get_text(separator='\n', strip=True)
+    soup.decompose()
+    return re.sub(r'\n\s*\n+', '\n\n', text).strip()
+
+# --- Candidate store (unfiltered per-message candidates for --refilter) ---
+BODY_ARTIFACTS = ["xbodyofmessage","xheadbodysepend","xbodyofmessageend",
+                  "xmsgbodyend","xheadofmessage","xheadofmessageend"]
+SUMMARY_FIELDNAMES = ["url","sender_name","sender_email","institution","subject",
+                      "hri_phrases_found","people_found","embedded_urls"]
+
+def phrases_text_from(text: str) -> str:
+    text = clean_text(text.lower())
+    text = re.sub(r'\b(' + '|'.join(BODY_ARTIFACTS) + r')\b', ' ', text)
+    return clean_text(text)
+
+def load_candidate_store(path):
+    """One record per URL; the watcher and interrupted runs append, so a later line replaces an earlier one."""
+    records = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records[record["url"]] = record
+    return list(records.values())
+
+def save_candidate_store(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def compact_candidate_store(path):
+    """
+    Rewrite the store with only the last record appended for each URL, so records for other months (or the
+    watcher's) are kept while re-fetched URLs are replaced. Streams the file: only line numbers are held in
+    memory, never the bodies. Returns the store size.
+    """
+    last_line = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if line.strip():
+                last_line[json.loads(line)["url"]] = line_no
+    keep = set(last_line.values())
+    tmp_path = path + ".tmp"
+    with open(path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+        for line_no, line in enumerate(src):
+            if line_no in keep:
+                dst.write(line if line.endswith("\n") else line + "\n")
+    os.replace(tmp_path, path)
+    return len(keep)
+
+def candidate_store_urls(path):
+    """URLs present in the store, read line by line without keeping the records; empty if there is no store."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {json.loads(line)["url"] for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+def append_candidate_record(path, record):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def filter_urls_by_date(urls, start_date, end_date):
+    start_date_int = start_date[0] * 100 + start_date[1]
+    end_date_int   = end_date[0]   * 100 + end_date[1]
+    kept = []
+    for url in urls:
+        match = re.search(r'/(\d{4})-(\d{2})/', url)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            url_date_int = year * 100 + month
+            if start_date_int <= url_date_int <= end_date_int:
+                kept.append(url)
+    return kept
+
+def finalize_row(record, seed_keywords_normalized, nlp_chunk_chars=NLP_CHUNK_CHARS, phrase_verdicts=None):
+    """
+    Turn a stored candidate record into a summary row: people cleanup, HRI relevance filtering and fallbacks.
+    Everything here is keyword-dependent, so it is what --refilter replays. If the subject fallback needs
+    phrases that were never extracted, they are computed with spaCy and cached on the record.
+    phrase_verdicts is passed through to filter_for_hri_relevance.
+    Returns (row_data, hri_phrases, people).
+    """
+    row_data = {
+        "url": record["url"], "sender_name": "Unknown Name", "sender_email": "unknown@unknown",
+        "institution": "unknown_domain", "subject": "Unknown Subject",
+        "hri_phrases_found": "", "people_found": "", "embedded_urls": ""
+    }
+    if record.get("error"):
+        row_data.update({"subject": f"Processing Error ({record['error']})"})
+        return row_data, [], []
+
+    sender_name = record["sender_name"]
+    sender_email = record["sender_email"]
+    subject = record["subject"]
+    if not record.get("has_body"):
+        row_data.update({
+            "sender_name": sender_name,
+            "sender_email": sender_email,
+            "institution": record["domain"],
+            "subject": subject
+        })
+        return row_data, [], []
+
+    body_text = record["body_text"]
+    people = validate_people(record["person_entities"], sender_name)
+
+    # --- HRI phrases with fallbacks ---
+    hri_phrases = filter_for_hri_relevance(
+        record["all_phrases"],
+        seed_keywords_normalized=seed_keywords_normalized,
+        phrase_verdicts=phrase_verdicts
+    )
+
+    # Fallback 1: include subject if none found
+    if not hri_phrases:
+        if record.get("phrases_with_subject") is None:
+            record["phrases_with_subject"] = extract_noun_phrases_chunked(
+                (phrases_text_from(chunk) for chunk in split_for_nlp(subject + " " + body_text, nlp_chunk_chars)),
+                min_words_in_phrase=2,
+                # stay consistent with whatever produced all_phrases for this record
+                phrase_extractor=record.get("phrase_extractor", "noun_chunks")
+            )
+        hri_phrases = filter_for_hri_relevance(
+            record["phrases_with_subject"],
+            seed_keywords_normalized=seed_keywords_normalized,
+            phrase_verdicts=phrase_verdicts
+        )
+
+    # Fallback 2: last-resort seed singleton sweep across subject+body
+    if not hri_phrases:
+        text_norm = (subject + " " + body_text).translate(str.maketrans("", "", string.punctuation)).lower()
+        seed_hits = sorted({
+            s for s in seed_keywords_normalized
+            if re.search(r"\b" + re.escape(s) + r"\b", text_norm)
+        })
+        strong_hits = [s for s in seed_hits if _has_strong_hri_token([s])]
+        hri_phrases = strong_hits or seed_hits
+
+    row_data.update({
+        "sender_name": sender_name,
+        "sender_email": sender_email,
+        "institution": record["institution"],
+        "subject": subject,
+        "hri_phrases_found": "; ".join(sorted(set(hri_phrases))),
+        "people_found": "; ".join(sorted(set(people))),
+        "embedded_urls": "; ".join(sorted(record["embedded_urls"]))
+    })
+    return row_data, hri_phrases, people
+
+def save_summary(all_rows_data, path="hri_analysis_summary.csv"):
+    if all_rows_data:
+        # Coerce None -> ""
+        for row in all_rows_data:
+            for k in SUMMARY_FIELDNAMES:
+                if row.get(k) is None:
+                    row[k] = ""
+
+        with open(path, "w", newline='', encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(all_rows_data)
+
+        print(f"\n\n✅ Analysis complete. All data saved to {path}")
+    else:
+        print("\n\n No data was processed to save.")
+
+def append_summary_row(row_data, path="hri_analysis_summary.csv"):
+    """Append one row to the summary CSV, writing the header first if the file is new or empty."""
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline='', encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDNAMES)
+        if write_header:
+            writer.writeheader()
+        writer.writerow({k: ("" if row_data.get(k) is None else row_data[k]) for k in SUMMARY_FIELDNAMES})
+
+async def extract_candidates(page, url, limiter, nlp_chunk_chars=NLP_CHUNK_CHARS, max_body_chars=MAX_BODY_CHARS,
+                             max_html_mb=MAX_HTML_MB, phrase_extractor="noun_chunks"):
+    """Fetch one message and run the expensive part of the pipeline (parsing + spaCy) into a store record."""
+    await goto(page, url, limiter, timeout=60000, wait_until="domcontentloaded")
+    await page.wait_for_timeout(1500)
+    # Passed straight through, not bound to a local, so parse_message holds the only reference to the page
+    return parse_message(url, await page_content(page, url), nlp_chunk_chars=nlp_chunk_chars,
+                         max_body_chars=max_body_chars, max_html_mb=max_html_mb, phrase_extractor=phrase_extractor)
+
+def parse_message(url, html_content, nlp_chunk_chars=NLP_CHUNK_CHARS, max_body_chars=MAX_BODY_CHARS,
+                  max_html_mb=MAX_HTML_MB, phrase_extractor="noun_chunks"):
+    if not html_content or len(html_content) < 1000:
+        raise Exception("HTML content too short or empty")
+    # Cheap pre-check first: UTF-8 never uses fewer bytes than characters
+    if len(html_content) > max_html_mb * 1024 * 1024:
+        raise MessageTooLarge(f"HTML exceeds {max_html_mb} MB")
+    html_bytes = len(html_content.encode("utf-8"))
+    if html_bytes > max_html_mb * 1024 * 1024:
+        raise MessageTooLarge(f"HTML is {html_bytes / 1024 / 1024:.1f} MB (budget {max_html_mb} MB)")
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    del html_content  # the soup holds everything still needed; free the page string before the NLP passes
+
+    # Extract headers (From/Subject) from header block if present
+    extracted_headers = {}
+    header_ul = None
+    start_comment = soup.find(string=lambda t: isinstance(t, Comment) and "X-Head-of-Message" in t and "End" not in t)
+    if start_comment:
+        node = start_comment.find_next_sibling()
+        while node:
+            if isinstance(node, Comment) and "X-Head-of-Message-End" in node:
+                break
+            if getattr(node, "name", None) == 'ul':
+                header_ul = node
+                break
+            node = node.find_next_sibling()
+
+    if header_ul:
+        for li in header_ul.find_all('li', recursive=False):
+            strong_tag = li.find('strong')
+            if strong_tag:
+                key = strong_tag.get_text(strip=True).rstrip(':').strip()
+                value_parts = list(e.strip() for e in strong_tag.next_siblings
+                                   if isinstance(e, NavigableString) and e.strip()) + \
+                              list(e.get_text(separator=' ', strip=True) for e in strong_tag.next_siblings if getattr(e, "name", None))
+                extracted_headers[key] = " ".join(filter(None, value_parts)).strip()
+        sender_name, sender_email = extract_sender_info(extracted_headers.get("From", ""))
+        subject = extract_subject_fallback(extracted_headers.get("Subject", "Unknown Subject"))
+        if sender_name in {"Unknown Name", "", None} and isinstance(sender_email, str) and "@" in sender_email:
+            local_part = sender_email.split("@", 1)[0]
+            tokens = re.split(r"[.\-_]", local_part)
+            clean_tokens = [t for t in tokens if t.isalpha() and len(t) > 1]
+            LIST_ALIASES = {"roboticsworldwide","hri-list","mailinglist","listserv","mailer-daemon"}
+            if set(clean_tokens).isdisjoint(LIST_ALIASES) and clean_tokens:
+                sender_name = " ".join(token.capitalize() for token in clean_tokens)
+            else:
+                sender_name = "Unknown Name"
+    else:
+        raw_text = soup.get_text('\n', strip=True)
+        sender_name, sender_email = extract_sender_info(raw_text)
+        subject = extract_subject_fallback(raw_text)
+
+    domain = extract_domain(sender_email)
+
+    # Sympa body extraction
+    html_snippet = extract_sympa_body(soup)
+    # Everything needed from the page tree is extracted; break its reference cycles now rather than at next GC
+    soup.decompose()
+    body_text = get_body_text_from_html(html_snippet) if html_snippet else "(Body not parsed)"
+
+    record = {
+        "url": url, "sender_name": sender_name, "sender_email": sender_email,
+        "domain": domain, "subject": subject, "has_body": False
+    }
+    if body_text and not body_text.startswith("("):
+        if len(body_text) > max_body_chars:
+            original_len = len(body_text)
+            body_text = truncate_at_paragraph(body_text, max_body_chars)
+            print(f"  ✂️ Body truncated from {original_len} to {len(body_text)} chars")
+        body_chunks = split_for_nlp(body_text, nlp_chunk_chars)
+        if len(body_chunks) > 1:
+            print(f"  🧩 Long body: spaCy runs over {len(body_chunks)} chunks")
+
+        # Two variants of each chunk, built lazily so only the chunk spaCy is working on exists in both forms;
+        # the subject goes with the first chunk only:
+        ner_texts = (text_for_ner(subject if i == 0 else "", chunk)       # case-preserving for NER
+                     for i, chunk in enumerate(body_chunks))
+        phrases_texts = (phrases_text_from(chunk) for chunk in body_chunks)  # EXCLUDE subject from phrases
+
+        record.update({
+            "has_body": True,
+            "body_text": body_text,
+            "institution": get_institution(domain, subject + " " + body_text, KNOWN_INSTITUTIONS),
+            # Extract URLs from HTML (not just text)
+            "embedded_urls": extract_urls_from_html(html_snippet),
+            "all_phrases": extract_noun_phrases_chunked(phrases_texts, min_words_in_phrase=2,
+                                                        phrase_extractor=phrase_extractor),
+            "phrase_extractor": phrase_extractor,
+            "person_entities": extract_person_entities_chunked(ner_texts, phrase_extractor=phrase_extractor),
+            "phrases_with_subject": None,
+        })
+    return record
 
 # --- Main Execution Logic ---
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/91.0.4472.124 Safari/537.36")
+
+def seeds_for_list(sympa_list, combined_seeds):
+    seeds = set(combined_seeds) | set(sympa_list.get("seeds") or [])
+    return frozenset(_normalize_token(w) for w in seeds if _normalize_token(w))
+
 async def main():
     args = get_date_args()
-    START_YEAR, START_MONTH = args.start_date
-    END_YEAR, END_MONTH = args.end_date
 
-    # Build the combined seed set (built-in + CLI)
+    # Build the combined seed set (built-in + CLI); per-list seeds are added on top in seeds_for_list
     extra_seeds_raw = set(args.extra_seeds or [])
     combined_seeds = set(HRI_SEED_KEYWORDS) | extra_seeds_raw
-    HRI_SEED_NORMALIZED_LOCAL = {_normalize_token(w) for w in combined_seeds if _normalize_token(w)}
 
     if extra_seeds_raw:
         print(f"Using extra HRI seeds: {sorted(extra_seeds_raw)}")
 
     try:
-        with open("all_message_links.txt", "r") as f:
+        sympa_lists = get_lists(args.lists)
+    except ValueError as e:
+        print(f"Error: {e}"); return
+
+    if args.refilter:
+        for sympa_list in sympa_lists:
+            refilter(args, sympa_list, seeds_for_list(sympa_list, combined_seeds))
+        report_cache_stats()
+        return
+
+    # Replay never touches the network, so there is nothing to rate-limit
+    limiter = HostRateLimiter(0 if args.replay_warc else args.min_request_interval)
+    async with open_pool(headless=False, user_agent=USER_AGENT,
+                         record_warc=args.record_warc, replay_warc=args.replay_warc) as pool:
+        # Lists run concurrently: network waits of one list overlap with parsing/spaCy of another
+        results = await asyncio.gather(
+            *(analyze_list(args, sympa_list, seeds_for_list(sympa_list, combined_seeds), pool, limiter)
+              for sympa_list in sympa_lists),
+            return_exceptions=True
+        )
+        for sympa_list, result in zip(sympa_lists, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ [{sympa_list['name']}] Analysis failed: {type(result).__name__} - {result}")
+
+    report_cache_stats()
+
+async def analyze_list(args, sympa_list, seed_keywords_normalized, pool, limiter):
+    tag = f"[{sympa_list['name']}]"
+    links_path = list_output_path(sympa_list, "all_message_links.txt")
+    try:
+        with open(links_path, "r") as f:
             all_urls_from_file = [line.strip() for line in f if line.strip()]
     except FileNotFoundError:
-        print("Error: all_message_links.txt not found."); return
+        print(f"Error: {tag} {links_path} not found."); return
     if not all_urls_from_file:
-        print("No URLs found in all_message_links.txt."); return
+        print(f"{tag} No URLs found in {links_path}."); return
 
-    print(f"Found {len(all_urls_from_file)} total URLs in the file.")
-    print(f"Filtering for dates from {START_YEAR}-{START_MONTH:02d} to {END_YEAR}-{END_MONTH:02d}...")
+    (start_year, start_month), (end_year, end_month) = args.start_date, args.end_date
+    print(f"{tag} Found {len(all_urls_from_file)} total URLs in {links_path}.")
+    print(f"{tag} Filtering for dates from {start_year}-{start_month:02d} to {end_year}-{end_month:02d}...")
 
-    urls = []
-    start_date_int = START_YEAR * 100 + START_MONTH
-    end_date_int   = END_YEAR   * 100 + END_MONTH
-
-    for url in all_urls_from_file:
-        match = re.search(r'/(\d{4})-(\d{2})/', url)
-        if match:
-            year, month = int(match.group(1)), int(match.group(2))
-            url_date_int = year * 100 + month
-            if start_date_int <= url_date_int <= end_date_int:
-                urls.append(url)
-    print(f"Found {len(urls)} URLs within the specified date range to process.")
+    urls = filter_urls_by_date(all_urls_from_file, args.start_date, args.end_date)
+    print(f"{tag} Found {len(urls)} URLs within the specified date range to process.")
 
     if not urls:
-        print("No matching URLs found to process. Exiting.")
+        print(f"{tag} No matching URLs found to process.")
         return
 
     all_rows_data = []
+    store_path = list_output_path(sympa_list, args.candidates_store)
+    page = await pool.new_page(sympa_list["base"])
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                                                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                                                        "Chrome/91.0.4472.124 Safari/537.36"))
-        page = await context.new_page()
-
-        for url_idx, url in enumerate(urls):
-            print(f"\n--- Processing URL {url_idx+1}/{len(urls)}: {url} ---")
-            row_data = {
-                "url": url, "sender_name": "Unknown Name", "sender_email": "unknown@unknown",
-                "institution": "unknown_domain", "subject": "Unknown Subject",
-                "hri_phrases_found": "", "people_found": "", "embedded_urls": ""
-            }
-            try:
-                await page.goto(url, timeout=60000, wait_until="domcontentloaded")
-                await page.wait_for_timeout(1500)
-                html_content = await page.content()
-                if not html_content or len(html_content) < 1000:
-                    raise Exception("HTML content too short or empty")
-
-                soup = BeautifulSoup(html_content, "html.parser")
-
-                # Extract headers (From/Subject) from header block if present
-                extracted_headers = {}
-                header_ul = None
-                start_comment = soup.find(string=lambda t: isinstance(t, Comment) and "X-Head-of-Message" in t and "End" not in t)
-                if start_comment:
-                    node = start_comment.find_next_sibling()
-                    while node:
-                        if isinstance(node, Comment) and "X-Head-of-Message-End" in node:
-                            break
-                        if getattr(node, "name", None) == 'ul':
-                            header_ul = node
-                            break
-                        node = node.find_next_sibling()
-
-                if header_ul:
-                    for li in header_ul.find_all('li', recursive=False):
-                        strong_tag = li.find('strong')
-                        if strong_tag:
-                            key = strong_tag.get_text(strip=True).rstrip(':').strip()
-                            value_parts = list(e.strip() for e in strong_tag.next_siblings
-                                               if isinstance(e, NavigableString) and e.strip()) + \
-                                          list(e.get_text(separator=' ', strip=True) for e in strong_tag.next_siblings if getattr(e, "name", None))
-                            extracted_headers[key] = " ".join(filter(None, value_parts)).strip()
-                    sender_name, sender_email = extract_sender_info(extracted_headers.get("From", ""))
-                    subject = extract_subject_fallback(extracted_headers.get("Subject", "Unknown Subject"))
-                    if sender_name in {"Unknown Name", "", None} and isinstance(sender_email, str) and "@" in sender_email:
-                        local_part = sender_email.split("@", 1)[0]
-                        tokens = re.split(r"[.\-_]", local_part)
-                        clean_tokens = [t for t in tokens if t.isalpha() and len(t) > 1]
-                        LIST_ALIASES = {"roboticsworldwide","hri-list","mailinglist","listserv","mailer-daemon"}
-                        if set(clean_tokens).isdisjoint(LIST_ALIASES) and clean_tokens:
-                            sender_name = " ".join(token.capitalize() for token in clean_tokens)
-                        else:
-                            sender_name = "Unknown Name"
-                else:
-                    raw_text = soup.get_text('\n', strip=True)
-                    sender_name, sender_email = extract_sender_info(raw_text)
-                    subject = extract_subject_fallback(raw_text)
-
-                domain = extract_domain(sender_email)
-
-                # Sympa body extraction
-                html_snippet = extract_sympa_body(soup)
-                body_text = get_body_text_from_html(html_snippet) if html_snippet else "(Body not parsed)"
-
-                if body_text and not body_text.startswith("("):
-                    # Build two variants of the text:
-                    ner_text = text_for_ner(subject, body_text)                 # case-preserving for NER
-                    phrases_text = clean_text(body_text.lower())                 # EXCLUDE subject from phrases
-                    artifacts = ["xbodyofmessage","xheadbodysepend","xbodyofmessageend",
-                                 "xmsgbodyend","xheadofmessage","xheadofmessageend"]
-                    phrases_text = re.sub(r'\b(' + '|'.join(artifacts) + r')\b', ' ', phrases_text)
-                    phrases_text = clean_text(phrases_text)
-
-                    all_phrases, people = extract_noun_phrases_and_people(
-                        text_for_phrases=phrases_text,
-                        text_for_ner_input=ner_text,
-                        min_words_in_phrase=2
-                    )
-
-                    # Add sender (with one-token exception if name-like), then re-filter/dedupe
-                    people = include_sender(people, sender_name)
-                    people = post_filter_people(people)
-                    people = [p for p in people if is_clean_name(p)]
-
-                    # Final guard: ensure sender appears if it looks like a real name
-                    sn = strip_leading_titles((sender_name or "").strip('"\':<> ').strip())
-                    if sn and sn != "Unknown Name" and is_clean_name(sn):
-                        people = sorted(set(people + [sn]))
-
-                    # Final cleanup
-                    people = [p for p in people
-                              if not PEOPLE_PHRASE_DENY_REGEX.search(p)
-                              and not PEOPLE_PHRASE_DENY_REGEX.search(_normalize_simple(p))
-                              and not all(tok.lower() in PEOPLE_TOKEN_DENY for tok in p.split())]
-
-                    # --- HRI phrases with fallbacks ---
-                    hri_phrases = filter_for_hri_relevance(
-                        all_phrases,
-                        seed_keywords_normalized=HRI_SEED_NORMALIZED_LOCAL
-                    )
-
-                    # Fallback 1: include subject if none found
-                    if not hri_phrases:
-                        phrases_text_with_subject = clean_text((subject + " " + body_text).lower())
-                        phrases_text_with_subject = re.sub(r'\b(' + '|'.join(artifacts) + r')\b', ' ', phrases_text_with_subject)
-                        phrases_text_with_subject = clean_text(phrases_text_with_subject)
-                        all_phrases2, _ = extract_noun_phrases_and_people(
-                            text_for_phrases=phrases_text_with_subject,
-                            text_for_ner_input=ner_text,
-                            min_words_in_phrase=2
-                        )
-                        hri_phrases = filter_for_hri_relevance(
-                            all_phrases2,
-                            seed_keywords_normalized=HRI_SEED_NORMALIZED_LOCAL
-                        )
-
-                    # Fallback 2: last-resort seed singleton sweep across subject+body
-                    if not hri_phrases:
-                        text_norm = (subject + " " + body_text).translate(str.maketrans("", "", string.punctuation)).lower()
-                        seed_hits = sorted({
-                            s for s in HRI_SEED_NORMALIZED_LOCAL
-                            if re.search(r"\b" + re.escape(s) + r"\b", text_norm)
-                        })
-                        strong_hits = [s for s in seed_hits if _has_strong_hri_token([s])]
-                        hri_phrases = strong_hits or seed_hits
-
-                    final_institution = get_institution(domain, subject + " " + body_text, KNOWN_INSTITUTIONS)
-
-                    # Extract URLs from HTML (not just text)
-                    extracted_urls = extract_urls_from_html(html_snippet)
-
-                    row_data.update({
-                        "sender_name": sender_name,
-                        "sender_email": sender_email,
-                        "institution": final_institution,
-                        "subject": subject,
-                        "hri_phrases_found": "; ".join(sorted(set(hri_phrases))),
-                        "people_found": "; ".join(sorted(set(people))),
-                        "embedded_urls": "; ".join(sorted(extracted_urls))
-                    })
-
-                    print(f"  📨 Subject: {subject}")
-                    print(f"  👤 Sender: {sender_name} <{sender_email}> (Final Institution: {final_institution})")
-                    if hri_phrases:
-                        print(f"  💬 HRI Phrases (sample): {', '.join(hri_phrases[:3])}...")
-                    if people:
-                        print(f"  👥 People (sample): {', '.join(sorted(people)[:3])}...")
-                else:
-                    row_data.update({
-                        "sender_name": sender_name,
-                        "sender_email": sender_email,
-                        "institution": domain,
-                        "subject": subject
-                    })
-
-            except Exception as e:
-                print(f"  ⚠️ Processing Failed for {url}: {type(e).__name__} - {e}")
-                traceback.print_exc()
-                row_data.update({"subject": f"Processing Error ({type(e).__name__})"})
-
-            all_rows_data.append(row_data)
-
-        await context.close()
-        await browser.close()
+    for url_idx, url in enumerate(urls):
+        print(f"\n--- {tag} Processing URL {url_idx+1}/{len(urls)}: {url} ---")
+        try:
+            record = await extract_candidates(page, url, limiter, nlp_chunk_chars=args.nlp_chunk_chars,
+                                              max_body_chars=args.max_body_chars,
+                                              max_html_mb=args.max_html_mb,
+                                              phrase_extractor=args.phrase_extractor)
+            row_data, hri_phrases, people = finalize_row(record, seed_keywords_normalized,
+                                                         nlp_chunk_chars=args.nlp_chunk_chars)
+
+            if record["has_body"]:
+                print(f"  📨 Subject: {record['subject']}")
+                print(f"  👤 Sender: {record['sender_name']} <{record['sender_email']}> "
+                      f"(Final Institution: {record['institution']})")
+                if hri_phrases:
+                    print(f"  💬 HRI Phrases (sample): {', '.join(hri_phrases[:3])}...")
+                if people:
+                    print(f"  👥 People (sample): {', '.join(sorted(people)[:3])}...")
+
+        except Exception as e:
+            print(f"  ⚠️ Processing Failed for {url}: {type(e).__name__} - {e}")
+            traceback.print_exc()
+            record = {"url": url, "error": type(e).__name__}
+            row_data, _, _ = finalize_row(record, seed_keywords_normalized)
+
+        # Written as produced, so bodies never pile up in memory and an interrupted run keeps what it fetched
+        append_candidate_record(store_path, record)
+        all_rows_data.append(row_data)
+
+    await page.close()
 
     # --- Saving Final Consolidated Output ---
-    if all_rows_data:
-        fieldnames = ["url","sender_name","sender_email","institution","subject",
-                      "hri_phrases_found","people_found","embedded_urls"]
-
-        # Coerce None -> ""
-        for row in all_rows_data:
-            for k in fieldnames:
-                if row.get(k) is None:
-                    row[k] = ""
-
-        with open("hri_analysis_summary.csv", "w", newline='', encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_rows_data)
-
-        print("\n\n✅ Analysis complete. All data saved to hri_analysis_summary.csv")
-    else:
-        print("\n\n No data was processed to save.")
+    store_size = compact_candidate_store(store_path)
+    print(f"\n💾 {tag} Saved {len(all_rows_data)} candidate records to {store_path} ({store_size} stored in total)")
+    save_summary(all_rows_data, list_output_path(sympa_list, "hri_analysis_summary.csv"))
+
+def refilter(args, sympa_list, seed_keywords_normalized):
+    """Re-apply relevance filtering and people cleanup over the candidate store; no browser, no parsing."""
+    tag = f"[{sympa_list['name']}]"
+    store_path = list_output_path(sympa_list, args.candidates_store)
+    try:
+        records = load_candidate_store(store_path)
+    except FileNotFoundError:
+        print(f"Error: {tag} {store_path} not found. Run once without --refilter to build it."); return
+
+    in_range = set(filter_urls_by_date([r["url"] for r in records], args.start_date, args.end_date))
+    selected = [r for r in records if r["url"] in in_range]
+    print(f"{tag} Re-filtering {len(selected)} of {len(records)} stored messages from {store_path}...")
+
+    # Judge every distinct stored phrase once up front; per-message filtering below only looks verdicts up
+    verdicts = judge_phrases((
+        phrase
+        for record in selected if record.get("has_body")
+        for phrase in record["all_phrases"] + (record.get("phrases_with_subject") or [])
+    ), seed_keywords_normalized)
+    judged = len(verdicts)
+    print(f"{tag} Judged {judged} distinct phrases ({sum(verdicts.values())} HRI-relevant).")
+
+    backfilled = 0
+    all_rows_data = []
+    for record in selected:
+        needed_subject_phrases = record.get("has_body") and record.get("phrases_with_subject") is None
+        row_data, _, _ = finalize_row(record, seed_keywords_normalized, nlp_chunk_chars=args.nlp_chunk_chars,
+                                      phrase_verdicts=verdicts)
+        if needed_subject_phrases and record.get("phrases_with_subject") is not None:
+            backfilled += 1
+        all_rows_data.append(row_data)
+
+    if len(verdicts) > judged:
+        print(f"{tag} Judged {len(verdicts) - judged} more phrases from newly extracted subject fallbacks.")
+
+    # Subject-fallback phrases computed on demand are kept so the next refilter doesn't need spaCy for them
+    if backfilled:
+        save_candidate_store(store_path, records)
+        print(f"💾 {tag} Stored subject-fallback phrases for {backfilled} messages in {store_path}")
+    save_summary(all_rows_data, list_output_path(sympa_list, "hri_analysis_summary.csv"))
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,249 @@
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from html.parser import HTMLParser
+from io import BytesIO
+from urllib.parse import urlparse, urldefrag
+from weakref import WeakKeyDictionary
+
+# Minimum seconds between two requests to the same host, shared by every list crawled in the process
+DEFAULT_MIN_REQUEST_INTERVAL = 1.0
+
+class HostRateLimiter:
+    def __init__(self, min_interval=DEFAULT_MIN_REQUEST_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._locks = {}
+
+    async def wait(self, url):
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_slot.get(host, 0) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_slot[host] = loop.time() + self.min_interval
+
+class BrowserPool:
+    """
+    One browser for every list; one context per host, so the anti-spam confirmation and its cookies are
+    shared by all lists on the same server.
+    """
+    def __init__(self, playwright, headless=False, user_agent=None, recorder=None):
+        self._playwright = playwright
+        self._headless = headless
+        self._user_agent = user_agent
+        self._recorder = recorder
+        self._browser = None
+        self._contexts = {}
+        self._lock = asyncio.Lock()
+
+    async def new_page(self, url):
+        host = urlparse(url).netloc
+        async with self._lock:
+            if self._browser is None:
+                self._browser = await self._playwright.chromium.launch(headless=self._headless)
+            if host not in self._contexts:
+                kwargs = {"user_agent": self._user_agent} if self._user_agent else {}
+                self._contexts[host] = await self._browser.new_context(**kwargs)
+                if self._recorder is not None:
+                    self._contexts[host].on("response", self._recorder.on_response)
+        page = await self._contexts[host].new_page()
+        if self._recorder is not None:
+            _page_recorders[page] = self._recorder
+        return page
+
+    async def close(self):
+        if self._recorder is not None:
+            await self._recorder.drain()
+        for context in self._contexts.values():
+            await context.close()
+        if self._browser is not None:
+            await self._browser.close()
+
+async def goto(page, url, limiter, **kwargs):
+    await limiter.wait(url)
+    return await page.goto(url, **kwargs)
+
+async def page_content(page, url):
+    """
+    page.content(), also recorded as a rendered snapshot keyed by the URL the script asked for. The anti-spam
+    POST can leave the page on a different URL than the one navigated to; replay serves these snapshots first.
+    """
+    html = await page.content()
+    recorder = _page_recorders.get(page)
+    if recorder is not None:
+        recorder.record_rendered(url, html)
+    return html
+
+def extract_hrefs(html):
+    collector = _LinkCollector()
+    collector.feed(html)
+    return collector.hrefs
+
+# --- WARC snapshot recording / offline replay (needs `pip install warcio`) ---
+# Playwright hands over decoded bodies, so the transfer headers describing the wire encoding are dropped.
+_WIRE_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+# Rendered snapshots are 'resource' records tagged with this profile, so replay can tell them from raw responses
+RENDERED_PROFILE = "urn:sympa-hri:rendered"
+_page_recorders = WeakKeyDictionary()
+
+class WarcRecorder:
+    """
+    Writes every response seen by the browser contexts it is attached to as a WARC 'response' record, plus
+    the HTML each script actually read (see page_content) as a 'resource' record.
+    """
+    def __init__(self, path):
+        from warcio.warcwriter import WARCWriter
+        self.path = path
+        self._file = open(path, "wb")
+        self._writer = WARCWriter(self._file, gzip=path.endswith(".gz"))
+        self._pending = set()
+        self.records = 0
+
+    def on_response(self, response):
+        task = asyncio.ensure_future(self._record(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _record(self, response):
+        from warcio.statusandheaders import StatusAndHeaders
+        try:
+            body = await response.body()
+        except Exception:
+            return  # redirects and aborted requests have no body to keep
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS]
+        http_headers = StatusAndHeaders(f"{response.status} {response.status_text}".strip(), headers,
+                                        protocol="HTTP/1.1")
+        record = self._writer.create_warc_record(response.url, "response", payload=BytesIO(body),
+                                                 length=len(body), http_headers=http_headers)
+        self._writer.write_record(record)
+        self.records += 1
+
+    def record_rendered(self, url, html):
+        body = html.encode("utf-8")
+        record = self._writer.create_warc_record(url, "resource", payload=BytesIO(body), length=len(body),
+                                                 warc_content_type="text/html; charset=utf-8",
+                                                 warc_headers_dict={"WARC-Profile": RENDERED_PROFILE})
+        self._writer.write_record(record)
+        self.records += 1
+
+    async def drain(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def close(self):
+        self._file.close()
+        print(f"📼 Recorded {self.records} responses to {self.path}")
+
+class ReplayMiss(Exception):
+    pass
+
+class _LinkCollector(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self.hrefs.append(dict(attrs).get("href"))
+
+class ReplayPage:
+    """The subset of the Playwright Page API both scripts use, answered from a WARC snapshot."""
+    def __init__(self, pool):
+        self._pool = pool
+        self._html = ""
+        self.url = None
+
+    async def goto(self, url, **kwargs):
+        self._html = self._pool.lookup(url)
+        self.url = url
+
+    async def content(self):
+        return self._html
+
+    async def click(self, selector, **kwargs):
+        # Snapshots keep the page served after the anti-spam confirmation; there is nothing to click
+        raise ReplayMiss("no interactive elements in a replayed page")
+
+    async def wait_for_timeout(self, timeout):
+        return None
+
+    async def close(self):
+        return None
+
+class ReplayPool:
+    """
+    Drop-in for BrowserPool that serves pages from WARC files with no network. Only an offset index is held in
+    memory; bodies are read back on demand. Rendered snapshots (what the script read after navigating and
+    clicking, keyed by the URL it asked for) win over raw responses; among raw responses for one URL (e.g. the
+    anti-spam challenge, then the real page) the last 200 HTML response wins.
+    """
+    def __init__(self, warc_paths):
+        from warcio.archiveiterator import ArchiveIterator
+        self._rendered = {}
+        self._offsets = {}
+        for path in warc_paths:
+            with open(path, "rb") as f:
+                records = ArchiveIterator(f)
+                for record in records:
+                    url = urldefrag(record.rec_headers.get_header("WARC-Target-URI") or "")[0]
+                    if record.rec_type == "resource":
+                        if record.rec_headers.get_header("WARC-Profile") == RENDERED_PROFILE:
+                            self._rendered[url] = (path, records.get_record_offset())
+                        continue
+                    if record.rec_type != "response" or record.http_headers is None:
+                        continue
+                    if record.http_headers.get_statuscode() != "200":
+                        continue
+                    if "html" not in (record.http_headers.get_header("Content-Type") or ""):
+                        continue
+                    self._offsets[url] = (path, records.get_record_offset())
+        print(f"📼 Replaying {len(self._rendered)} rendered and {len(self._offsets)} raw HTML pages "
+              f"from {len(warc_paths)} WARC file(s)")
+
+    def lookup(self, url):
+        from warcio.archiveiterator import ArchiveIterator
+        url = urldefrag(url)[0]
+        candidates = (url, url + "/", url.rstrip("/"))
+        for index in (self._rendered, self._offsets):
+            for candidate in candidates:
+                if candidate not in index:
+                    continue
+                path, offset = index[candidate]
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    record = next(iter(ArchiveIterator(f)))
+                    headers = record.http_headers if record.rec_type == "response" else record.rec_headers
+                    content_type = headers.get_header("Content-Type") or ""
+                    charset = re.search(r"charset=([\w-]+)", content_type)
+                    return record.content_stream().read().decode(charset.group(1) if charset else "utf-8",
+                                                                 errors="replace")
+        raise ReplayMiss(f"{url} is not in the WARC snapshot")
+
+    async def new_page(self, url):
+        return ReplayPage(self)
+
+    async def close(self):
+        return None
+
+@asynccontextmanager
+async def open_pool(headless=False, user_agent=None, record_warc=None, replay_warc=None):
+    """BrowserPool over a live browser (optionally recording to record_warc), or a ReplayPool over replay_warc."""
+    if replay_warc:
+        yield ReplayPool(replay_warc)
+        return
+
+    from playwright.async_api import async_playwright
+    recorder = WarcRecorder(record_warc) if record_warc else None
+    try:
+        async with async_playwright() as p:
+            pool = BrowserPool(p, headless=headless, user_agent=user_agent, recorder=recorder)
+            try:
+                yield pool
+            finally:
+                await pool.close()
+    finally:
+        if recorder is not None:
+            recorder.close()
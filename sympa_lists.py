@@ -0,0 +1,41 @@
+import os
+import re
+from urllib.parse import urlparse
+
+# --- Registry of Sympa archives we follow ---
+# base:      archive index URL (.../sympa/arc/<list>)
+# seeds:     extra HRI seed keywords merged in for this list only
+# namespace: directory for this list's outputs (links file, candidate store, summary CSV)
+SYMPA_LISTS = {
+    "robotics-worldwide": {
+        "base": "https://www.lists.kit.edu/sympa/arc/robotics-worldwide",
+        "seeds": [],
+        # Kept at the repo root so the existing outputs and docs stay valid
+        "namespace": ".",
+    },
+}
+
+def csv_list(s: str):
+    """argparse type shared by every script: comma/semicolon separated, trimmed, empties dropped."""
+    return [p.strip() for p in re.split(r"[;,]", s) if p.strip()]
+
+def get_lists(names=None):
+    """
+    Registry entries (with their 'name' filled in) for the given list names, or every list if none given.
+    Each list's namespace directory is created here, once, so list_output_path is a plain join.
+    """
+    names = names or list(SYMPA_LISTS)
+    unknown = [n for n in names if n not in SYMPA_LISTS]
+    if unknown:
+        raise ValueError(f"Unknown list(s): {', '.join(unknown)}. Known: {', '.join(SYMPA_LISTS)}")
+    sympa_lists = [dict(SYMPA_LISTS[n], name=n, namespace=SYMPA_LISTS[n].get("namespace") or n) for n in names]
+    for sympa_list in sympa_lists:
+        os.makedirs(sympa_list["namespace"], exist_ok=True)
+    return sympa_lists
+
+def archive_name(sympa_list) -> str:
+    """Last path segment of the archive URL, as it appears in month/message links."""
+    return urlparse(sympa_list["base"]).path.rstrip("/").rsplit("/", 1)[-1]
+
+def list_output_path(sympa_list, filename: str) -> str:
+    return os.path.join(sympa_list["namespace"], filename)
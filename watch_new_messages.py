@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import traceback
+from datetime import datetime, timezone
+from collect_all_messages import collect_month_links
+from hri_analyze_messages import (
+    HRI_SEED_KEYWORDS, MAX_BODY_CHARS, MAX_HTML_MB, NLP_CHUNK_CHARS, PHRASE_EXTRACTORS, USER_AGENT,
+    MessageTooLarge, append_candidate_record, append_summary_row, candidate_store_urls, extract_candidates,
+    finalize_row, get_nlp, max_body_chars_arg, max_html_mb_arg, nlp_chunk_chars_arg, report_cache_stats,
+    seeds_for_list
+)
+from sympa_fetch import HostRateLimiter, DEFAULT_MIN_REQUEST_INTERVAL, open_pool
+from sympa_lists import csv_list, get_lists, list_output_path
+
+# --- Continuous watch mode: poll each list's current month and analyze only messages we haven't seen ---
+DEFAULT_POLL_INTERVAL = 600
+MSG_NUMBER_RE = re.compile(r"msg(\d+)\.html$")
+# A message that fails this many polls in a row is stored as an error record, as the batch run does at once
+MAX_FETCH_ATTEMPTS = 3
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Poll Sympa archives and analyze new posts as they appear.")
+    parser.add_argument("--lists", type=csv_list, default=None,
+                        help="Lists from sympa_lists.py to watch (default: every registered list)")
+    parser.add_argument("--poll_interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f"Seconds between polls (default: {DEFAULT_POLL_INTERVAL})")
+    parser.add_argument("--state", default="watch_state.json",
+                        help="Where the last seen message per list is kept (default: watch_state.json)")
+    parser.add_argument("--catch_up", action="store_true",
+                        help="On a list's first poll, analyze the whole current month instead of only "
+                             "messages posted after the watcher started")
+    parser.add_argument("--extra_seeds", type=csv_list, default=[],
+                        help="Extra HRI seed keywords (comma/semicolon-separated)")
+    parser.add_argument("--candidates_store", default="hri_candidates.jsonl",
+                        help="Candidate store appended to, inside each list's namespace (default: hri_candidates.jsonl)")
+    parser.add_argument("--phrase_extractor", choices=PHRASE_EXTRACTORS, default="noun_chunks",
+                        help="'noun_chunks' (dependency parser) or 'fast' (POS patterns, parser disabled)")
+    parser.add_argument("--nlp_chunk_chars", type=nlp_chunk_chars_arg, default=NLP_CHUNK_CHARS,
+                        help=f"Max characters per spaCy call (default: {NLP_CHUNK_CHARS})")
+    parser.add_argument("--max_body_chars", type=max_body_chars_arg, default=MAX_BODY_CHARS,
+                        help=f"Per-message body size budget (default: {MAX_BODY_CHARS})")
+    parser.add_argument("--max_html_mb", type=max_html_mb_arg, default=MAX_HTML_MB,
+                        help=f"Per-message HTML budget in MB of UTF-8 (default: {MAX_HTML_MB})")
+    parser.add_argument("--min_request_interval", type=float, default=DEFAULT_MIN_REQUEST_INTERVAL,
+                        help=f"Minimum seconds between requests to the same host "
+                             f"(default: {DEFAULT_MIN_REQUEST_INTERVAL})")
+    parser.add_argument("--record_warc", default=None,
+                        help="Record every response to this WARC file; needs warcio")
+    return parser.parse_args()
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_state(path, state):
+    # Write-then-rename so a kill mid-write never leaves a truncated state file behind
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def current_month():
+    return datetime.now(timezone.utc).strftime("%Y-%m")
+
+def months_through(first, last):
+    """Every YYYY-MM from first to last inclusive; just [last] if first is not before it."""
+    year, mon = map(int, first.split("-"))
+    months = []
+    while f"{year:04d}-{mon:02d}" < last:
+        months.append(f"{year:04d}-{mon:02d}")
+        year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return months + [last]
+
+def new_messages(month_links, last_seen):
+    """(number, url) of messages above last_seen, oldest first, without duplicates across index pages."""
+    numbered = {}
+    for url in month_links:
+        match = MSG_NUMBER_RE.search(url)
+        if match and int(match.group(1)) > last_seen:
+            numbered[int(match.group(1))] = url
+    return sorted(numbered.items())
+
+def load_known_urls(args, sympa_list):
+    """URLs already in the list's candidate store (analyzed by a batch run or an earlier watch) and links file."""
+    try:
+        with open(list_output_path(sympa_list, "all_message_links.txt"), "r", encoding="utf-8") as f:
+            linked = {line.strip() for line in f if line.strip()}
+    except FileNotFoundError:
+        linked = set()
+    return {"stored": candidate_store_urls(list_output_path(sympa_list, args.candidates_store)), "linked": linked}
+
+async def analyze_new_message(args, sympa_list, seed_keywords_normalized, page, limiter, url, known,
+                              final_attempt=False):
+    """
+    Analyze one message and append it to the list's outputs. Returns False, writing nothing, if the fetch or
+    parse failed and should be retried on a later poll; the last attempt stores an error record instead.
+    """
+    tag = f"[{sympa_list['name']}]"
+    print(f"\n--- {tag} New message: {url} ---")
+    try:
+        record = await extract_candidates(page, url, limiter, nlp_chunk_chars=args.nlp_chunk_chars,
+                                          max_body_chars=args.max_body_chars, max_html_mb=args.max_html_mb,
+                                          phrase_extractor=args.phrase_extractor)
+        row_data, hri_phrases, _ = finalize_row(record, seed_keywords_normalized,
+                                                nlp_chunk_chars=args.nlp_chunk_chars)
+        if record["has_body"]:
+            print(f"  📨 Subject: {record['subject']}")
+            if hri_phrases:
+                print(f"  💬 HRI Phrases (sample): {', '.join(hri_phrases[:3])}...")
+    except Exception as e:
+        print(f"  ⚠️ Processing Failed for {url}: {type(e).__name__} - {e}")
+        traceback.print_exc()
+        # An oversized page will not shrink on retry; anything else (timeouts, challenge pages) may pass later
+        if not final_attempt and not isinstance(e, MessageTooLarge):
+            print(f"  🔁 {tag} Will retry on the next poll")
+            return False
+        record = {"url": url, "error": type(e).__name__}
+        row_data, _, _ = finalize_row(record, seed_keywords_normalized)
+
+    append_candidate_record(list_output_path(sympa_list, args.candidates_store), record)
+    append_summary_row(row_data, list_output_path(sympa_list, "hri_analysis_summary.csv"))
+    known["stored"].add(url)
+    if url not in known["linked"]:
+        with open(list_output_path(sympa_list, "all_message_links.txt"), "a", encoding="utf-8") as f:
+            f.write(url + "\n")
+        known["linked"].add(url)
+    return True
+
+async def poll_list(args, sympa_list, seed_keywords_normalized, page, limiter, state, known, stop):
+    tag = f"[{sympa_list['name']}]"
+    entry = state.setdefault(sympa_list["name"], {})
+    month = current_month()
+
+    # Messages that failed on an earlier poll are retried first; last_seen has already moved past them
+    for url, attempts in list(entry.get("failed", {}).items()):
+        if stop.is_set():
+            return
+        if await analyze_new_message(args, sympa_list, seed_keywords_normalized, page, limiter, url, known,
+                                     final_attempt=attempts + 1 >= MAX_FETCH_ATTEMPTS):
+            del entry["failed"][url]
+        else:
+            entry["failed"][url] = attempts + 1
+        save_state(args.state, state)
+
+    # Resume in the saved month (posts may have landed just before it ended), then sweep every later month
+    # in full; after a long stop or restart these include months the watcher never saw
+    months = months_through(entry["month"], month) if entry.get("month") else [month]
+    for polled_month in months:
+        month_url = f"{sympa_list['base'].rstrip('/')}/{polled_month}/"
+        month_links = await collect_month_links(page, month_url, limiter, tag)
+
+        if entry.get("month") == polled_month:
+            last_seen = entry["last_seen"]
+        elif not entry and not args.catch_up:
+            # First poll ever: everything already posted counts as seen
+            numbers = [int(m.group(1)) for m in map(MSG_NUMBER_RE.search, month_links) if m]
+            entry.update({"month": polled_month, "last_seen": max(numbers, default=-1)})
+            print(f"👀 {tag} Watching {month_url} from message {entry['last_seen'] + 1}")
+            continue
+        else:
+            last_seen = -1
+
+        pending = new_messages(month_links, last_seen)
+        if pending:
+            print(f"🆕 {tag} {len(pending)} new message(s) in {polled_month}")
+        for number, url in pending:
+            if stop.is_set():
+                return
+            if url in known["stored"]:
+                # Covered by a batch run, or stored just before a crash that kept last_seen from being saved
+                print(f"⏭️ {tag} Already analyzed: {url}")
+            elif not await analyze_new_message(args, sympa_list, seed_keywords_normalized, page, limiter, url,
+                                               known):
+                entry.setdefault("failed", {})[url] = 1
+            entry.update({"month": polled_month, "last_seen": number})
+            save_state(args.state, state)
+
+        if entry.get("month") != polled_month:
+            entry.update({"month": polled_month, "last_seen": -1})
+
+async def watch(args):
+    try:
+        sympa_lists = get_lists(args.lists)
+    except ValueError as e:
+        print(f"Error: {e}"); return
+
+    combined_seeds = set(HRI_SEED_KEYWORDS) | set(args.extra_seeds or [])
+    seeds = {l["name"]: seeds_for_list(l, combined_seeds) for l in sympa_lists}
+    known = {l["name"]: load_known_urls(args, l) for l in sympa_lists}
+    state = load_state(args.state)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, AttributeError, RuntimeError, ValueError):
+            pass  # e.g. Windows: Ctrl+C arrives as KeyboardInterrupt and the finally below still saves state
+
+    get_nlp()  # load the model once, up front, and keep it warm for the whole run
+    limiter = HostRateLimiter(args.min_request_interval)
+    try:
+        async with open_pool(headless=False, user_agent=USER_AGENT, record_warc=args.record_warc) as pool:
+            pages = {l["name"]: await pool.new_page(l["base"]) for l in sympa_lists}
+            print(f"🔁 Watching {len(sympa_lists)} list(s), polling every {args.poll_interval:g}s. "
+                  f"Ctrl+C to stop.")
+            while not stop.is_set():
+                results = await asyncio.gather(
+                    *(poll_list(args, l, seeds[l["name"]], pages[l["name"]], limiter, state, known[l["name"]], stop)
+                      for l in sympa_lists),
+                    return_exceptions=True
+                )
+                for sympa_list, result in zip(sympa_lists, results):
+                    if isinstance(result, Exception):
+                        print(f"⚠️ [{sympa_list['name']}] Poll failed: {type(result).__name__} - {result}")
+                save_state(args.state, state)
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=args.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        save_state(args.state, state)
+        print(f"\n💾 Watch state saved to {args.state}")
+        report_cache_stats()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(watch(get_args()))
+    except KeyboardInterrupt:
+        pass